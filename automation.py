@@ -15,17 +15,40 @@ import os
 import sys
 import json
 import time
+import queue
+import atexit
 import logging
 import argparse
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the standard library
+    orjson = None
+
 # Add project root to path
 script_dir = Path(__file__).parent
 project_root = script_dir.parent
 sys.path.append(str(project_root))
 
+def read_json(path: Path) -> Dict:
+    """Read a JSON file, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'rb') as f:
+        return json.load(f)
+
+def write_json(path: Path, data: Dict):
+    """Write a JSON file with 2-space indentation, using orjson when available"""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
 class LogMonitorAutomation:
     """All-in-one automation system"""
     
@@ -34,6 +57,7 @@ class LogMonitorAutomation:
         self.project_root = self.script_dir.parent
         self.config_file = self.script_dir / "config.json"
         self.log_file = self.script_dir / "automation.log"
+        self.state_file = self.script_dir / "scan_state.json"
         
         # Load configuration
         self.config = self.load_config()
@@ -71,33 +95,60 @@ class LogMonitorAutomation:
         
         if self.config_file.exists():
             try:
-                with open(self.config_file) as f:
-                    config = json.load(f)
                 # Merge with defaults
-                for key, value in default_config.items():
-                    if key not in config:
-                        config[key] = value
-                return config
+                return {**default_config, **read_json(self.config_file)}
             except Exception as e:
                 print(f"[WARN] Error loading config, using defaults: {e}")
         
         # Create default config
-        with open(self.config_file, 'w') as f:
-            json.dump(default_config, f, indent=2)
+        write_json(self.config_file, default_config)
         
         print(f"[CREATED] Default config: {self.config_file}")
         return default_config
     
+    def load_scan_state(self):
+        """Restore the log monitor's scan position from the state file"""
+        if not self.state_file.exists():
+            return
+        
+        try:
+            state = read_json(self.state_file)
+            self.log_monitor.scan_file_id = (state['st_dev'], state['st_ino'])
+            self.log_monitor.scan_offset = state['offset']
+        except Exception as e:
+            print(f"[WARN] Error loading scan state, rescanning from start: {e}")
+    
+    def save_scan_state(self):
+        """Persist the log monitor's scan position to the state file"""
+        if self.log_monitor.scan_file_id is None:
+            return
+        
+        st_dev, st_ino = self.log_monitor.scan_file_id
+        write_json(self.state_file, {
+            'st_dev': st_dev,
+            'st_ino': st_ino,
+            'offset': self.log_monitor.scan_offset
+        })
+    
     def setup_logging(self):
         """Setup logging"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(self.log_file),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
+        # Callers only enqueue records; a background listener does the I/O
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        handlers = [
+            logging.FileHandler(self.log_file),
+            logging.StreamHandler(sys.stdout)
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        log_queue = queue.SimpleQueue()
+        self.log_listener = QueueListener(log_queue, *handlers)
+        self.log_listener.start()
+        atexit.register(self.log_listener.stop)
+        
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
         self.logger = logging.getLogger(__name__)
     
     def setup(self):
@@ -144,17 +195,26 @@ class LogMonitorAutomation:
         log_path = Path(self.config['log_file_path'])
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         test_errors = [
-            f"ERROR {datetime.now().strftime('%Y-%m-%d %H:%M:%S,123')} django.db.backends 12345 67890 DatabaseError: UNIQUE constraint failed: clients_client.email",
-            f"ERROR {datetime.now().strftime('%Y-%m-%d %H:%M:%S,456')} django.request 12345 67890 Internal Server Error: AttributeError: 'NoneType' object has no attribute 'gym'",
-            f"WARNING {datetime.now().strftime('%Y-%m-%d %H:%M:%S,789')} django.security 12345 67890 PermissionDenied: User does not have permission to access /admin/",
-            f"ERROR {datetime.now().strftime('%Y-%m-%d %H:%M:%S,012')} django.request 12345 67890 ValidationError: Invalid membership plan selected",
-            f"WARNING {datetime.now().strftime('%Y-%m-%d %H:%M:%S,345')} django.db 12345 67890 Slow query detected: SELECT * FROM clients_client took 2.5 seconds"
+            f"ERROR {now},123 django.db.backends 12345 67890 DatabaseError: UNIQUE constraint failed: clients_client.email",
+            f"ERROR {now},456 django.request 12345 67890 Internal Server Error: AttributeError: 'NoneType' object has no attribute 'gym'",
+            f"WARNING {now},789 django.security 12345 67890 PermissionDenied: User does not have permission to access /admin/",
+            f"ERROR {now},012 django.request 12345 67890 ValidationError: Invalid membership plan selected",
+            f"WARNING {now},345 django.db 12345 67890 Slow query detected: SELECT * FROM clients_client took 2.5 seconds"
         ]
         
-        with open(log_path, 'a', encoding='utf-8') as f:
-            for error in test_errors:
-                f.write(error + '\n')
+        chunks = [error.encode('utf-8') + b'\n' for error in test_errors]
+        if hasattr(os, 'writev'):
+            # One scatter-gather syscall for the whole batch
+            fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.writev(fd, chunks)
+            finally:
+                os.close(fd)
+        else:
+            with open(log_path, 'ab') as f:
+                f.writelines(chunks)
         
         print(f"[SUCCESS] Added {len(test_errors)} test errors to {log_path}")
     
@@ -163,7 +223,10 @@ class LogMonitorAutomation:
         print("[SCAN] Scanning logs for errors...")
         
         try:
+            # Resume from where the previous scan stopped
+            self.load_scan_state()
             errors = self.log_monitor.monitor_logs(follow=False)
+            self.save_scan_state()
             
             if not errors:
                 print("[SUCCESS] No errors found")
@@ -177,33 +240,27 @@ class LogMonitorAutomation:
                 print(f"[LIMIT] Limiting to {max_batch} errors")
                 errors = errors[:max_batch]
             
-            processed = 0
-            for error in errors:
-                try:
-                    print(f"\n[PROCESS] {error.error_type} in {error.file_path}")
-                    
-                    # Create issue (simulated)
-                    issue_data = self.github_integrator.create_issue_from_error(error)
-                    print(f"   [ISSUE] Would create: {issue_data['title']}")
-                    
-                    # Create PR (simulated)
-                    pr_data = self.github_integrator.create_pr_from_error(error, 999)
-                    print(f"   [PR] Would create: {pr_data['title']}")
-                    
-                    processed += 1
-                    
-                except Exception as e:
-                    print(f"   [ERROR] Processing failed: {e}")
+            results = self.github_integrator.process_errors_batch(errors)
             
-            print(f"\n[SUMMARY] {processed}/{len(errors)} errors processed")
+            print(f"\n[SUMMARY] {results['errors_processed']}/{len(errors)} errors processed")
+            if results['skipped']:
+                print(f"[SKIPPED] {results['skipped']} duplicate errors")
+            if results['failed']:
+                print(f"[FAILED] {results['failed']} errors could not be processed")
             
         except Exception as e:
             print(f"[ERROR] Scan failed: {e}")
     
     def monitor_continuous(self):
         """Start continuous monitoring"""
+        from log_monitor import LogWatcher
+        
         interval = self.config['monitor_interval']
-        print(f"[MONITOR] Starting continuous monitoring (every {interval}s)")
+        watcher = LogWatcher(self.config['log_file_path'])
+        if watcher.available:
+            print(f"[MONITOR] Starting continuous monitoring (watching {self.config['log_file_path']})")
+        else:
+            print(f"[MONITOR] Starting continuous monitoring (every {interval}s)")
         print("[INFO] Press Ctrl+C to stop")
         
         try:
@@ -211,13 +268,19 @@ class LogMonitorAutomation:
                 print(f"\n[SCAN] Scanning at {datetime.now().strftime('%H:%M:%S')}")
                 self.scan_logs()
                 
-                print(f"[WAIT] Waiting {interval} seconds...")
-                time.sleep(interval)
+                if watcher.available:
+                    print("[WAIT] Waiting for log changes...")
+                    watcher.wait()
+                else:
+                    print(f"[WAIT] Waiting {interval} seconds...")
+                    time.sleep(interval)
                 
         except KeyboardInterrupt:
             print("\n[STOP] Monitoring stopped by user")
         except Exception as e:
             print(f"[ERROR] Monitoring error: {e}")
+        finally:
+            watcher.close()
     
     def show_status(self):
         """Show system status"""
@@ -231,23 +294,32 @@ class LogMonitorAutomation:
         print(f"   Interval: {self.config['monitor_interval']}s")
         
         # Log file status
-        log_path = Path(self.config['log_file_path'])
-        if log_path.exists():
-            size = log_path.stat().st_size
-            print(f"[LOG] Log file: {size} bytes")
-        else:
+        try:
+            log_stat = os.stat(self.config['log_file_path'])
+            print(f"[LOG] Log file: {log_stat.st_size} bytes")
+        except OSError:
             print("[LOG] Log file: NOT FOUND")
         
         # Recent activity
-        if self.log_file.exists():
+        try:
+            activity_stat = os.stat(self.log_file)
+        except OSError:
+            activity_stat = None
+        
+        if activity_stat is not None:
             print(f"[ACTIVITY] Automation log: {self.log_file}")
             try:
-                with open(self.log_file) as f:
-                    lines = f.readlines()
-                    if lines:
-                        print("   Recent activity:")
-                        for line in lines[-3:]:
-                            print(f"   {line.strip()}")
+                # Only the last few KB are needed for the recent lines
+                start = max(0, activity_stat.st_size - 4096)
+                with open(self.log_file, 'rb') as f:
+                    f.seek(start)
+                    lines = f.read().decode('utf-8', 'replace').splitlines()
+                if start > 0:
+                    lines = lines[1:]  # First line may be cut off
+                if lines:
+                    print("   Recent activity:")
+                    for line in lines[-3:]:
+                        print(f"   {line.strip()}")
             except Exception:
                 pass
         
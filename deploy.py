@@ -11,10 +11,11 @@ import subprocess
 from pathlib import Path
 
 def run_command(cmd, description):
-    """Run a command and handle errors"""
+    """Run a command (argv list, no shell) and handle errors"""
     print(f"🔧 {description}...")
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        # Only stderr is kept, for the failure message
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
         if result.returncode != 0:
             print(f"❌ Failed: {result.stderr}")
             return False
@@ -32,20 +33,20 @@ def main():
     script_dir = Path(__file__).parent
     
     # Check Python
-    if not run_command("python --version", "Checking Python"):
+    if not run_command([sys.executable, "--version"], "Checking Python"):
         print("❌ Python not found. Please install Python 3.8+")
         return False
     
     # Install dependencies (if requirements.txt exists)
     req_file = script_dir / "requirements.txt"
     if req_file.exists():
-        if not run_command("pip install -r requirements.txt", "Installing dependencies"):
+        if not run_command([sys.executable, "-m", "pip", "install", "-r", str(req_file)], "Installing dependencies"):
             print("⚠️ Some dependencies may have failed to install")
     
     # Run setup
     automation_script = script_dir / "automation.py"
     if automation_script.exists():
-        if not run_command(f"python {automation_script} setup", "Running setup"):
+        if not run_command([sys.executable, str(automation_script), "setup"], "Running setup"):
             print("❌ Setup failed")
             return False
     else:
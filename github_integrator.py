@@ -6,44 +6,50 @@ Integrates with MCP GitHub tools to create issues and PRs from log errors
 
 import json
 import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from functools import lru_cache
+from string import Template
+from typing import List, Dict, Optional, Tuple
 from log_monitor import LogMonitor, LogError
 
-class GitHubIntegrator:
-    """Integrates log monitoring with GitHub issue/PR creation"""
-    
-    def __init__(self, repo_owner: str, repo_name: str):
-        self.repo_owner = repo_owner
-        self.repo_name = repo_name
-        self.created_issues = {}  # Track created issues to avoid duplicates
-    
-    def create_issue_from_error(self, error: LogError) -> Dict:
-        """Create a GitHub issue from a log error"""
-        
-        # Generate issue title
-        title = f"🐛 {error.error_type.replace('_', ' ').title()}: {error.file_path}"
-        
-        # Generate issue body
-        body = f"""## 🚨 Automated Error Detection
+# Path separators become dashes in fix branch names
+_PATH_TO_SLUG = str.maketrans({'/': '-', '\\': '-'})
 
-**Error Type:** `{error.error_type}`
-**Severity:** `{error.severity}`
-**File:** `{error.file_path}`
-**Timestamp:** `{error.timestamp}`
+# Issue labels by error type
+_DEFAULT_LABELS = ('automated', 'bug')
+_LABELS = {
+    'database_error': ('automated', 'bug', 'critical', 'high-priority'),
+    'server_error': ('automated', 'bug', 'critical', 'high-priority'),
+    'performance_issue': ('automated', 'bug', 'performance', 'optimization'),
+    'authentication_error': ('automated', 'bug', 'security', 'auth')
+}
+
+# Issue/PR bodies: constant header and footer around a templated middle
+_ISSUE_HEADER = "## 🚨 Automated Error Detection\n\n"
+
+_ISSUE_DETAILS_TMPL = Template("""**Error Type:** `$error_type`
+**Severity:** `$severity`
+**File:** `$file_path`
+**Timestamp:** `$timestamp`
 
 ### 📋 Error Details
 ```
-{error.message}
+$message
 ```
 
 ### 🔧 Suggested Fix
-{error.suggested_fix}
+$suggested_fix
 
 ### 📊 Error Context
-- **Log Level:** {error.level}
-- **Detection Time:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-- **Auto-generated:** This issue was created automatically by the log monitoring system
+- **Log Level:** $level
+- **Detection Time:** $detection_time
+""")
+
+_ISSUE_FOOTER = """- **Auto-generated:** This issue was created automatically by the log monitoring system
 
 ### ✅ Next Steps
 1. Review the error details above
@@ -54,48 +60,22 @@ class GitHubIntegrator:
 ---
 *This issue was automatically created by the Log Monitor system 🤖*"""
 
-        # Determine labels based on error type
-        labels = ['automated', 'bug']
-        if error.error_type in ['database_error', 'server_error']:
-            labels.extend(['critical', 'high-priority'])
-        elif error.error_type == 'performance_issue':
-            labels.extend(['performance', 'optimization'])
-        elif error.error_type == 'authentication_error':
-            labels.extend(['security', 'auth'])
-        
-        return {
-            'title': title,
-            'body': body,
-            'labels': labels,
-            'assignees': [],  # Can be configured
-        }
-    
-    def create_pr_from_error(self, error: LogError, issue_number: int) -> Dict:
-        """Create a GitHub PR with a fix for the error"""
-        
-        # Generate branch name
-        branch_name = f"fix/{error.error_type}-{error.file_path.replace('/', '-').replace('.py', '')}-{issue_number}"
-        
-        # Generate PR title
-        title = f"🔧 Fix: {error.error_type.replace('_', ' ').title()} in {error.file_path}"
-        
-        # Generate PR body
-        body = f"""## 🔧 Automated Fix for Log Error
+_PR_HEADER = "## 🔧 Automated Fix for Log Error\n\n"
 
-**Fixes:** #{issue_number}
-**Error Type:** `{error.error_type}`
-**File:** `{error.file_path}`
+_PR_DETAILS_TMPL = Template("""**Fixes:** #$issue_number
+**Error Type:** `$error_type`
+**File:** `$file_path`
 
 ### 📋 Changes Made
-This PR implements the suggested fix for the {error.error_type} detected in the logs.
+This PR implements the suggested fix for the $error_type detected in the logs.
 
 ### 🔍 Error Details
-- **Timestamp:** {error.timestamp}
-- **Message:** {error.message[:200]}...
-- **Severity:** {error.severity}
+- **Timestamp:** $timestamp
+- **Message:** $message...
+- **Severity:** $severity
 
 ### ✅ Solution Implemented
-{error.suggested_fix}
+$suggested_fix
 
 ### 🧪 Testing
 - [ ] Manual testing completed
@@ -105,41 +85,18 @@ This PR implements the suggested fix for the {error.error_type} detected in the
 
 ### 📊 Impact
 - **Risk Level:** Low (automated fix with standard patterns)
-- **Affected Areas:** {error.file_path}
-- **Breaking Changes:** None expected
+- **Affected Areas:** $file_path
+""")
+
+_PR_FOOTER = """- **Breaking Changes:** None expected
 
 ---
 *This PR was automatically created by the Log Monitor system 🤖*
 
 **Please review carefully before merging!**"""
 
-        return {
-            'branch': branch_name,
-            'title': title,
-            'body': body,
-            'head': branch_name,
-            'base': 'main'  # or 'master' depending on your default branch
-        }
-    
-    def generate_fix_code(self, error: LogError) -> str:
-        """Generate actual code fix based on error type"""
-        
-        if error.error_type == 'database_error':
-            return self._generate_database_fix_code(error)
-        elif error.error_type == 'authentication_error':
-            return self._generate_auth_fix_code(error)
-        elif error.error_type == 'validation_error':
-            return self._generate_validation_fix_code(error)
-        elif error.error_type == 'server_error':
-            return self._generate_server_error_fix_code(error)
-        elif error.error_type == 'performance_issue':
-            return self._generate_performance_fix_code(error)
-        else:
-            return self._generate_generic_fix_code(error)
-    
-    def _generate_database_fix_code(self, error: LogError) -> str:
-        """Generate database error fix code"""
-        return f'''# Database Error Fix for {error.file_path}
+# Fix code templates by error type; only the file path varies per error
+_DATABASE_FIX_CODE_TMPL = Template('''# Database Error Fix for $file_path
 # Added error handling and transaction management
 
 from django.db import transaction, IntegrityError
@@ -155,17 +112,15 @@ try:
         # This ensures atomicity and proper rollback on errors
         pass
 except IntegrityError as e:
-    logger.error(f"Database integrity error in {error.file_path}: {{e}}")
+    logger.error(f"Database integrity error in $file_path: {e}")
     # Handle the error appropriately
     raise ValidationError("Data integrity constraint violated")
 except Exception as e:
-    logger.error(f"Unexpected database error in {error.file_path}: {{e}}")
+    logger.error(f"Unexpected database error in $file_path: {e}")
     raise
-'''
-    
-    def _generate_auth_fix_code(self, error: LogError) -> str:
-        """Generate authentication error fix code"""
-        return f'''# Authentication Error Fix for {error.file_path}
+''')
+
+_AUTH_FIX_CODE_TMPL = Template('''# Authentication Error Fix for $file_path
 # Added proper authentication checks and error handling
 
 from django.contrib.auth.decorators import login_required
@@ -183,8 +138,8 @@ def your_view(request):
         # Your view logic here
         pass
     except PermissionDenied as e:
-        logger.warning(f"Permission denied in {error.file_path}: {{e}}")
-        return JsonResponse({{'error': 'Access denied'}}, status=403)
+        logger.warning(f"Permission denied in $file_path: {e}")
+        return JsonResponse({'error': 'Access denied'}, status=403)
 
 # For class-based views
 class YourView(LoginRequiredMixin, View):
@@ -192,14 +147,12 @@ class YourView(LoginRequiredMixin, View):
     
     def dispatch(self, request, *args, **kwargs):
         if not request.user.is_authenticated:
-            logger.warning(f"Unauthenticated access attempt in {error.file_path}")
+            logger.warning(f"Unauthenticated access attempt in $file_path")
             return redirect(self.login_url)
         return super().dispatch(request, *args, **kwargs)
-'''
-    
-    def _generate_validation_fix_code(self, error: LogError) -> str:
-        """Generate validation error fix code"""
-        return f'''# Validation Error Fix for {error.file_path}
+''')
+
+_VALIDATION_FIX_CODE_TMPL = Template('''# Validation Error Fix for $file_path
 # Added comprehensive validation and error handling
 
 from django import forms
@@ -215,7 +168,7 @@ class ImprovedForm(forms.Form):
         
         # Add your validation logic here
         if not cleaned_data.get('required_field'):
-            logger.warning(f"Validation failed in {error.file_path}: Missing required field")
+            logger.warning(f"Validation failed in $file_path: Missing required field")
             raise forms.ValidationError("Required field is missing")
         
         return cleaned_data
@@ -223,7 +176,7 @@ class ImprovedForm(forms.Form):
     def clean_field_name(self):
         data = self.cleaned_data.get('field_name')
         if data and len(data) < 3:
-            logger.warning(f"Validation failed in {error.file_path}: Field too short")
+            logger.warning(f"Validation failed in $file_path: Field too short")
             raise forms.ValidationError("Field must be at least 3 characters long")
         return data
 
@@ -235,13 +188,11 @@ def your_view(request):
             # Process valid data
             pass
         else:
-            logger.error(f"Form validation errors in {error.file_path}: {{form.errors}}")
-            return JsonResponse({{'errors': form.errors}}, status=400)
-'''
-    
-    def _generate_server_error_fix_code(self, error: LogError) -> str:
-        """Generate server error fix code"""
-        return f'''# Server Error Fix for {error.file_path}
+            logger.error(f"Form validation errors in $file_path: {form.errors}")
+            return JsonResponse({'errors': form.errors}, status=400)
+''')
+
+_SERVER_ERROR_FIX_CODE_TMPL = Template('''# Server Error Fix for $file_path
 # Added comprehensive error handling and logging
 
 from django.http import JsonResponse
@@ -261,28 +212,26 @@ def your_view(request):
             pass
         
         # Safe attribute access
-        data = getattr(request, 'data', {{}})
+        data = getattr(request, 'data', {})
         
         return render(request, 'template.html', context)
         
     except AttributeError as e:
-        logger.error(f"Attribute error in {error.file_path}: {{e}}")
-        logger.error(f"Traceback: {{traceback.format_exc()}}")
-        return JsonResponse({{'error': 'Internal server error'}}, status=500)
+        logger.error(f"Attribute error in $file_path: {e}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return JsonResponse({'error': 'Internal server error'}, status=500)
     
     except KeyError as e:
-        logger.error(f"Key error in {error.file_path}: {{e}}")
-        return JsonResponse({{'error': 'Missing required data'}}, status=400)
+        logger.error(f"Key error in $file_path: {e}")
+        return JsonResponse({'error': 'Missing required data'}, status=400)
     
     except Exception as e:
-        logger.error(f"Unexpected error in {error.file_path}: {{e}}")
-        logger.error(f"Traceback: {{traceback.format_exc()}}")
-        return JsonResponse({{'error': 'Internal server error'}}, status=500)
-'''
-    
-    def _generate_performance_fix_code(self, error: LogError) -> str:
-        """Generate performance issue fix code"""
-        return f'''# Performance Fix for {error.file_path}
+        logger.error(f"Unexpected error in $file_path: {e}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return JsonResponse({'error': 'Internal server error'}, status=500)
+''')
+
+_PERFORMANCE_FIX_CODE_TMPL = Template('''# Performance Fix for $file_path
 # Added query optimization and caching
 
 from django.core.cache import cache
@@ -294,12 +243,12 @@ logger = logging.getLogger(__name__)
 
 def optimized_view(request):
     # Cache key for this view
-    cache_key = f"view_data_{{request.user.id if request.user.is_authenticated else 'anonymous'}}"
+    cache_key = f"view_data_{request.user.id if request.user.is_authenticated else 'anonymous'}"
     
     # Try to get from cache first
     data = cache.get(cache_key)
     if data is None:
-        logger.info(f"Cache miss in {error.file_path}, fetching from database")
+        logger.info(f"Cache miss in $file_path, fetching from database")
         
         # Optimized database queries
         queryset = YourModel.objects.select_related(
@@ -315,11 +264,11 @@ def optimized_view(request):
         
         # Cache for 5 minutes
         cache.set(cache_key, data, 300)
-        logger.info(f"Data cached in {error.file_path}")
+        logger.info(f"Data cached in $file_path")
     else:
-        logger.info(f"Cache hit in {error.file_path}")
+        logger.info(f"Cache hit in $file_path")
     
-    return render(request, 'template.html', {{'data': data}})
+    return render(request, 'template.html', {'data': data})
 
 # Add database indexes in models.py
 class YourModel(models.Model):
@@ -331,11 +280,9 @@ class YourModel(models.Model):
             models.Index(fields=['name', 'created_at']),  # Composite index
             models.Index(fields=['-created_at']),  # For ordering
         ]
-'''
-    
-    def _generate_generic_fix_code(self, error: LogError) -> str:
-        """Generate generic error fix code"""
-        return f'''# Generic Error Fix for {error.file_path}
+''')
+
+_GENERIC_FIX_CODE_TMPL = Template('''# Generic Error Fix for $file_path
 # Added comprehensive error handling and logging
 
 import logging
@@ -350,43 +297,193 @@ def improved_function():
         pass
         
     except Exception as e:
-        logger.error(f"Error in {error.file_path}: {{e}}")
-        logger.error(f"Traceback: {{traceback.format_exc()}}")
+        logger.error(f"Error in $file_path: {e}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
         
         # Handle the error appropriately
         # Return error response or re-raise as needed
         raise
-'''
+''')
 
-    def process_errors_batch(self, errors: List[LogError]) -> Dict:
+@lru_cache(maxsize=256)
+def _render_fix_code(template: Template, file_path: str) -> str:
+    """Render a fix code template for a file, memoized per (template, file)"""
+    return template.substitute(file_path=file_path)
+
+class GitHubIntegrator:
+    """Integrates log monitoring with GitHub issue/PR creation"""
+    
+    MAX_TRACKED_ISSUES = 10000  # Oldest signatures are evicted past this
+    
+    def __init__(self, repo_owner: str, repo_name: str):
+        self.repo_owner = repo_owner
+        self.repo_name = repo_name
+        self.created_issues = OrderedDict()  # Track created issues to avoid duplicates
+        self._issues_lock = threading.Lock()  # Batches are processed from worker threads
+        
+        # Fix code generators by error type
+        self._fix_handlers = {
+            'database_error': self._generate_database_fix_code,
+            'authentication_error': self._generate_auth_fix_code,
+            'validation_error': self._generate_validation_fix_code,
+            'server_error': self._generate_server_error_fix_code,
+            'performance_issue': self._generate_performance_fix_code
+        }
+    
+    def _error_signature(self, error: LogError) -> bytes:
+        """Content hash identifying duplicate errors"""
+        key = f"{error.error_type}|{error.file_path}|{error.message[:200]}"
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    
+    def claim_error(self, error: LogError) -> bool:
+        """Record an error as handled; returns False if it was already seen"""
+        signature = self._error_signature(error)
+        with self._issues_lock:
+            if signature in self.created_issues:
+                self.created_issues.move_to_end(signature)
+                return False
+            self.created_issues[signature] = None
+            if len(self.created_issues) > self.MAX_TRACKED_ISSUES:
+                self.created_issues.popitem(last=False)
+            return True
+    
+    def release_error(self, error: LogError):
+        """Forget a claimed error so a later batch can retry it"""
+        with self._issues_lock:
+            self.created_issues.pop(self._error_signature(error), None)
+    
+    def create_issue_from_error(self, error: LogError) -> Dict:
+        """Create a GitHub issue from a log error"""
+        
+        # Generate issue title
+        title = f"🐛 {error.error_type.replace('_', ' ').title()}: {error.file_path}"
+        
+        # Generate issue body
+        details = _ISSUE_DETAILS_TMPL.substitute(
+            error_type=error.error_type,
+            severity=error.severity,
+            file_path=error.file_path,
+            timestamp=error.timestamp,
+            message=error.message,
+            suggested_fix=error.suggested_fix,
+            level=error.level,
+            detection_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
+        body = ''.join((_ISSUE_HEADER, details, _ISSUE_FOOTER))
+
+        return {
+            'title': title,
+            'body': body,
+            'labels': _LABELS.get(error.error_type, _DEFAULT_LABELS),
+            'assignees': [],  # Can be configured
+        }
+    
+    def create_pr_from_error(self, error: LogError, issue_number: int) -> Dict:
+        """Create a GitHub PR with a fix for the error"""
+        
+        # Generate branch name
+        slug = error.file_path.translate(_PATH_TO_SLUG)
+        if slug.endswith('.py'):
+            slug = slug[:-3]
+        branch_name = f"fix/{error.error_type}-{slug}-{issue_number}"
+        
+        # Generate PR title
+        title = f"🔧 Fix: {error.error_type.replace('_', ' ').title()} in {error.file_path}"
+        
+        # Generate PR body
+        details = _PR_DETAILS_TMPL.substitute(
+            issue_number=issue_number,
+            error_type=error.error_type,
+            file_path=error.file_path,
+            timestamp=error.timestamp,
+            message=error.message[:200],
+            severity=error.severity,
+            suggested_fix=error.suggested_fix
+        )
+        body = ''.join((_PR_HEADER, details, _PR_FOOTER))
+
+        return {
+            'branch': branch_name,
+            'title': title,
+            'body': body,
+            'head': branch_name,
+            'base': 'main'  # or 'master' depending on your default branch
+        }
+    
+    def generate_fix_code(self, error: LogError) -> str:
+        """Generate actual code fix based on error type"""
+        handler = self._fix_handlers.get(error.error_type, self._generate_generic_fix_code)
+        return handler(error)
+    
+    def _generate_database_fix_code(self, error: LogError) -> str:
+        """Generate database error fix code"""
+        return _render_fix_code(_DATABASE_FIX_CODE_TMPL, error.file_path)
+    
+    def _generate_auth_fix_code(self, error: LogError) -> str:
+        """Generate authentication error fix code"""
+        return _render_fix_code(_AUTH_FIX_CODE_TMPL, error.file_path)
+    
+    def _generate_validation_fix_code(self, error: LogError) -> str:
+        """Generate validation error fix code"""
+        return _render_fix_code(_VALIDATION_FIX_CODE_TMPL, error.file_path)
+    
+    def _generate_server_error_fix_code(self, error: LogError) -> str:
+        """Generate server error fix code"""
+        return _render_fix_code(_SERVER_ERROR_FIX_CODE_TMPL, error.file_path)
+    
+    def _generate_performance_fix_code(self, error: LogError) -> str:
+        """Generate performance issue fix code"""
+        return _render_fix_code(_PERFORMANCE_FIX_CODE_TMPL, error.file_path)
+    
+    def _generate_generic_fix_code(self, error: LogError) -> str:
+        """Generate generic error fix code"""
+        return _render_fix_code(_GENERIC_FIX_CODE_TMPL, error.file_path)
+
+    def _process_one(self, error: LogError) -> Tuple[Dict, Dict, str]:
+        """Build issue data, PR data and fix code for a single error"""
+        issue_data = self.create_issue_from_error(error)
+        pr_data = self.create_pr_from_error(error, 999)  # Placeholder issue number
+        fix_code = self.generate_fix_code(error)
+        return issue_data, pr_data, fix_code
+
+    def process_errors_batch(self, errors: List[LogError], max_workers: int = 8) -> Dict:
         """Process a batch of errors and create issues/PRs"""
         results = {
             'issues_created': 0,
             'prs_created': 0,
             'errors_processed': 0,
-            'skipped': 0
+            'skipped': 0,
+            'failed': 0
         }
         
-        for error in errors:
-            try:
-                # Create issue data
-                issue_data = self.create_issue_from_error(error)
-                
-                # Create PR data
-                pr_data = self.create_pr_from_error(error, 999)  # Placeholder issue number
-                
-                # Generate fix code
-                fix_code = self.generate_fix_code(error)
-                
-                print(f"📋 Would create issue: {issue_data['title']}")
-                print(f"🔧 Would create PR: {pr_data['title']}")
-                print(f"💻 Generated fix code ({len(fix_code)} chars)")
-                
-                results['errors_processed'] += 1
-                
-            except Exception as e:
-                print(f"❌ Error processing {error.error_type}: {e}")
-                results['skipped'] += 1
+        # Skip errors identical to ones already turned into issues
+        new_errors = [error for error in errors if self.claim_error(error)]
+        results['skipped'] += len(errors) - len(new_errors)
+        errors = new_errors
+        
+        if not errors:
+            return results
+        
+        # GitHub calls are I/O bound, so overlap them across worker threads
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(errors))) as executor:
+            futures = [executor.submit(self._process_one, error) for error in errors]
+            
+            # Report in input order so output stays deterministic
+            for error, future in zip(errors, futures):
+                print(f"\n🔍 Processing {error.error_type} in {error.file_path}")
+                try:
+                    issue_data, pr_data, fix_code = future.result()
+                    
+                    print(f"   📋 Would create issue: {issue_data['title']}")
+                    print(f"   🔧 Would create PR: {pr_data['title']}")
+                    print(f"   💻 Generated fix code ({len(fix_code)} chars)")
+                    
+                    results['errors_processed'] += 1
+                    
+                except Exception as e:
+                    print(f"   ❌ Error processing {error.error_type}: {e}")
+                    self.release_error(error)
+                    results['failed'] += 1
         
         return results
 
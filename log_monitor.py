@@ -4,120 +4,48 @@
 Monitors logs, detects errors, creates GitHub issues and PRs automatically
 """
 
+import os
 import re
 import json
+import mmap
+import stat
 import time
+import hashlib
+import select
+import struct
+import ctypes
+import ctypes.util
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
-@dataclass
-class LogError:
-    """Represents a detected error in logs"""
-    timestamp: str
-    level: str
-    message: str
-    file_path: str
-    line_number: Optional[int]
-    error_type: str
-    severity: str
-    suggested_fix: str
+try:
+    import re2
+except ImportError:  # Optional linear-time engine; fall back to the standard library
+    re2 = None
 
-class LogMonitor:
-    """Monitors logs and creates GitHub issues/PRs for detected errors"""
-    
-    def __init__(self, log_file_path: str, repo_owner: str, repo_name: str):
-        self.log_file_path = Path(log_file_path)
-        self.repo_owner = repo_owner
-        self.repo_name = repo_name
-        self.processed_errors = set()
-        
-        # Error patterns with suggested fixes
-        self.error_patterns = {
-            'database_error': {
-                'pattern': r'(DatabaseError|IntegrityError|OperationalError)',
-                'severity': 'high',
-                'labels': ['bug', 'database', 'critical'],
-                'fix_template': self._get_database_fix
-            },
-            'authentication_error': {
-                'pattern': r'(AuthenticationFailed|PermissionDenied|Unauthorized)',
-                'severity': 'medium',
-                'labels': ['bug', 'security', 'auth'],
-                'fix_template': self._get_auth_fix
-            },
-            'validation_error': {
-                'pattern': r'(ValidationError|Invalid.*|Bad.*Request)',
-                'severity': 'medium',
-                'labels': ['bug', 'validation'],
-                'fix_template': self._get_validation_fix
-            },
-            'server_error': {
-                'pattern': r'(500|Internal Server Error|AttributeError|KeyError)',
-                'severity': 'high',
-                'labels': ['bug', 'server-error', 'critical'],
-                'fix_template': self._get_server_error_fix
-            },
-            'performance_issue': {
-                'pattern': r'(slow query|timeout|performance)',
-                'severity': 'medium',
-                'labels': ['performance', 'optimization'],
-                'fix_template': self._get_performance_fix
-            }
-        }
-    
-    def parse_log_line(self, line: str) -> Optional[LogError]:
-        """Parse a log line and extract error information"""
-        # Django log format: LEVEL YYYY-MM-DD HH:MM:SS,mmm module PID TID message
-        log_pattern = r'(\w+)\s+(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2},\d{3})\s+(\w+)\s+\d+\s+\d+\s+(.*)'
-        
-        match = re.match(log_pattern, line.strip())
-        if not match:
-            return None
-            
-        level, timestamp, module, message = match.groups()
-        
-        # Check if this is an error we care about
-        if level not in ['ERROR', 'CRITICAL', 'WARNING']:
-            return None
-            
-        # Detect error type
-        error_type = self._detect_error_type(message)
-        if not error_type:
-            return None
-            
-        # Extract file path if available
-        file_path = self._extract_file_path(message)
-        
-        return LogError(
-            timestamp=timestamp,
-            level=level,
-            message=message,
-            file_path=file_path or f"{module}.py",
-            line_number=None,
-            error_type=error_type,
-            severity=self.error_patterns[error_type]['severity'],
-            suggested_fix=self.error_patterns[error_type]['fix_template'](message)
-        )
-    
-    def _detect_error_type(self, message: str) -> Optional[str]:
-        """Detect the type of error based on message content"""
-        for error_type, config in self.error_patterns.items():
-            if re.search(config['pattern'], message, re.IGNORECASE):
-                return error_type
-        return None
-    
-    def _extract_file_path(self, message: str) -> Optional[str]:
-        """Extract file path from error message"""
-        # Look for file paths in the message
-        path_pattern = r'([a-zA-Z_][a-zA-Z0-9_/\\]*\.py)'
-        match = re.search(path_pattern, message)
-        return match.group(1) if match else None
-    
-    def _get_database_fix(self, message: str) -> str:
-        """Generate database error fix"""
-        return """
+# Engine for the error-type classifier patterns
+_classifier_re = re2 if re2 is not None else re
+
+# Log levels that are reported as errors
+_ERROR_LEVELS = ('ERROR', 'CRITICAL', 'WARNING')
+_ERROR_LEVEL_PREFIXES = tuple(level.encode('ascii') for level in _ERROR_LEVELS)
+
+# Django log line over a whole mapped file; fields are separated by
+# non-newline whitespace so a match never spans two lines. Only error
+# levels are matched, so other lines are skipped inside the regex engine
+_LOG_LINE_RE = re.compile(
+    rb'^(ERROR|CRITICAL|WARNING)[^\S\n]+(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})'
+    rb'[^\S\n]+(\S+)[^\S\n]+\d+[^\S\n]+\d+[^\S\n]+([^\n]*)$',
+    re.MULTILINE
+)
+
+# Suggested fixes per error type
+_DATABASE_FIX = """
 # Database Error Fix
 
 ## Suggested Solution:
@@ -140,10 +68,8 @@ except IntegrityError as e:
     # Handle the error appropriately
 ```
 """
-    
-    def _get_auth_fix(self, message: str) -> str:
-        """Generate authentication error fix"""
-        return """
+
+_AUTH_FIX = """
 # Authentication Error Fix
 
 ## Suggested Solution:
@@ -163,10 +89,8 @@ def protected_view(request):
     pass
 ```
 """
-    
-    def _get_validation_fix(self, message: str) -> str:
-        """Generate validation error fix"""
-        return """
+
+_VALIDATION_FIX = """
 # Validation Error Fix
 
 ## Suggested Solution:
@@ -187,10 +111,8 @@ class YourForm(forms.Form):
         return data
 ```
 """
-    
-    def _get_server_error_fix(self, message: str) -> str:
-        """Generate server error fix"""
-        return """
+
+_SERVER_ERROR_FIX = """
 # Server Error Fix
 
 ## Suggested Solution:
@@ -213,10 +135,8 @@ def your_view(request):
         return JsonResponse({'error': 'Internal server error'}, status=500)
 ```
 """
-    
-    def _get_performance_fix(self, message: str) -> str:
-        """Generate performance issue fix"""
-        return """
+
+_PERFORMANCE_FIX = """
 # Performance Issue Fix
 
 ## Suggested Solution:
@@ -243,9 +163,210 @@ def get_cached_data(key):
 ```
 """
 
-    def create_error_signature(self, error: LogError) -> str:
+@dataclass(frozen=True)
+class LogError:
+    """Represents a detected error in logs"""
+    # Declared by hand since dataclass(slots=True) needs Python 3.10
+    __slots__ = ('timestamp', 'level', 'message', 'file_path', 'line_number',
+                 'error_type', 'severity', 'suggested_fix')
+    
+    timestamp: str
+    level: str
+    message: str
+    file_path: str
+    line_number: Optional[int]
+    error_type: str
+    severity: str
+    suggested_fix: str
+    
+    def __reduce__(self):
+        # Frozen slotted instances can't be unpickled via setattr; rebuild from fields
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
+class LogMonitor:
+    """Monitors logs and creates GitHub issues/PRs for detected errors"""
+    
+    FOLLOW_READ_SIZE = 1 << 20
+    PARALLEL_SCAN_MIN_BYTES = 64 * 1024 * 1024
+    MAX_PROCESSED_ERRORS = 100000  # Oldest signatures are evicted past this
+    
+    def __init__(self, log_file_path: str, repo_owner: str, repo_name: str):
+        self.log_file_path = Path(log_file_path)
+        self.repo_owner = repo_owner
+        self.repo_name = repo_name
+        self.processed_errors = OrderedDict()  # Bounded LRU of error signatures
+        
+        # Byte offset where the next one-time scan starts, and the
+        # (st_dev, st_ino) of the file that offset belongs to
+        self.scan_offset = 0
+        self.scan_file_id = None
+        
+        # Error patterns with suggested fixes; 'keywords' are lowercase
+        # literals, at least one of which must appear for the pattern to match
+        self.error_patterns = {
+            'database_error': {
+                'pattern': r'(DatabaseError|IntegrityError|OperationalError)',
+                'severity': 'high',
+                'labels': ['bug', 'database', 'critical'],
+                'fix': _DATABASE_FIX,
+                'keywords': ('databaseerror', 'integrityerror', 'operationalerror')
+            },
+            'authentication_error': {
+                'pattern': r'(AuthenticationFailed|PermissionDenied|Unauthorized)',
+                'severity': 'medium',
+                'labels': ['bug', 'security', 'auth'],
+                'fix': _AUTH_FIX,
+                'keywords': ('authenticationfailed', 'permissiondenied', 'unauthorized')
+            },
+            'validation_error': {
+                'pattern': r'(ValidationError|Invalid.*|Bad.*Request)',
+                'severity': 'medium',
+                'labels': ['bug', 'validation'],
+                'fix': _VALIDATION_FIX,
+                'keywords': ('validationerror', 'invalid', 'bad')
+            },
+            'server_error': {
+                'pattern': r'(500|Internal Server Error|AttributeError|KeyError)',
+                'severity': 'high',
+                'labels': ['bug', 'server-error', 'critical'],
+                'fix': _SERVER_ERROR_FIX,
+                'keywords': ('500', 'internal server error', 'attributeerror', 'keyerror')
+            },
+            'performance_issue': {
+                'pattern': r'(slow query|timeout|performance)',
+                'severity': 'medium',
+                'labels': ['performance', 'optimization'],
+                'fix': _PERFORMANCE_FIX,
+                'keywords': ('slow query', 'timeout', 'performance')
+            }
+        }
+        
+        # All error patterns compiled into one regex, one named group per type.
+        # The alternation sits inside a lookahead so finditer reports the
+        # first-listed type starting at every position and no match can hide
+        # another; the earliest type in error_patterns still wins overall
+        combined = '(?=' + '|'.join(
+            f"(?P<{error_type}>{config['pattern']})"
+            for error_type, config in self.error_patterns.items()
+        ) + ')'
+        self._combined_re = re.compile(combined, re.IGNORECASE)
+        self._type_priority = {error_type: rank for rank, error_type in enumerate(self.error_patterns)}
+        
+        # ASCII messages are matched lowercased and case-sensitively, with each
+        # type's alternatives bucketed by first character so every regex starts
+        # with a literal and gets SRE's fast prefix scan. Patterns are plain
+        # '(A|B|...)' alternations, so they can be split and lowercased safely.
+        # These use RE2 when installed, which bounds the work on '.*' patterns
+        self._prefix_groups = []
+        for error_type, config in self.error_patterns.items():
+            buckets = {}
+            for alternative in config['pattern'][1:-1].split('|'):
+                alternative = alternative.lower()
+                buckets.setdefault(alternative[0], []).append(alternative)
+            self._prefix_groups.append((
+                error_type,
+                config['keywords'],
+                [_classifier_re.compile('|'.join(alternatives)) for alternatives in buckets.values()]
+            ))
+        
+        # Django log format: LEVEL YYYY-MM-DD HH:MM:SS,mmm module PID TID message.
+        # Kept as one anchored match: str.split plus the field checks needed to
+        # accept exactly the same lines measured about twice as slow
+        self._log_re = re.compile(r'^(\S+)\s+(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})\s+(\S+)\s+\d+\s+\d+\s+([^\n]*)$', re.ASCII)
+        self._path_re = re.compile(r'([a-zA-Z_][a-zA-Z0-9_/\\]*\.py)')
+    
+    def parse_log_line(self, line: str) -> Optional[LogError]:
+        """Parse a log line and extract error information"""
+        # Reject other log levels before running the regex
+        if not line.startswith(_ERROR_LEVELS):
+            return None
+        
+        match = self._log_re.match(line)
+        if not match:
+            return None
+            
+        level, timestamp, module, message = match.groups()
+        return self._build_error(level, timestamp, module, message.rstrip())
+    
+    def _build_error(self, level: str, timestamp: str, module: str, message: str) -> Optional[LogError]:
+        """Build a LogError from parsed log fields, if it is one we care about"""
+        # Check if this is an error we care about
+        if level not in _ERROR_LEVELS:
+            return None
+            
+        # Detect error type
+        error_type = self._detect_error_type(message)
+        if not error_type:
+            return None
+            
+        # Extract file path if available
+        file_path = self._extract_file_path(message)
+        
+        config = self.error_patterns[error_type]
+        return LogError(
+            timestamp=timestamp,
+            level=level,
+            message=message,
+            file_path=file_path or f"{module}.py",
+            line_number=None,
+            error_type=error_type,
+            severity=config['severity'],
+            suggested_fix=config['fix']
+        )
+    
+    def _detect_error_type(self, message: str) -> Optional[str]:
+        """Detect the type of error based on message content"""
+        # Lowercasing only mirrors re.IGNORECASE exactly for ASCII text
+        if message.isascii():
+            lowered = message.lower()
+            
+            # Filter and verify: a type's regexes only run once a substring
+            # check has found one of the literals they require
+            for error_type, keywords, regexes in self._prefix_groups:
+                if not any(keyword in lowered for keyword in keywords):
+                    continue
+                for pattern in regexes:
+                    if pattern.search(lowered):
+                        return error_type
+            return None
+        
+        # Other text goes through the case-insensitive combined regex
+        best = None
+        for match in self._combined_re.finditer(message):
+            error_type = match.lastgroup
+            if best is None or self._type_priority[error_type] < self._type_priority[best]:
+                best = error_type
+                if self._type_priority[best] == 0:
+                    break
+        return best
+    
+    def _extract_file_path(self, message: str) -> Optional[str]:
+        """Extract file path from error message"""
+        # Look for file paths in the message
+        match = self._path_re.search(message)
+        return match.group(1) if match else None
+    
+    def create_error_signature(self, error: LogError) -> int:
         """Create a unique signature for the error to avoid duplicates"""
-        return f"{error.error_type}:{error.file_path}:{hash(error.message[:100])}"
+        # 64-bit fingerprint that, unlike hash(), is stable across runs
+        key = '\0'.join((error.error_type, error.file_path, error.message[:100]))
+        return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+    
+    def _collect_error(self, line: str, errors: List[LogError]):
+        """Parse a line and append its error if not already processed"""
+        self._record_error(self.parse_log_line(line), errors)
+    
+    def _record_error(self, error: Optional[LogError], errors: List[LogError]):
+        """Append an error if its signature has not been processed yet"""
+        if error:
+            signature = self.create_error_signature(error)
+            if signature in self.processed_errors:
+                self.processed_errors.move_to_end(signature)
+                return
+            errors.append(error)
+            self.processed_errors[signature] = None
+            if len(self.processed_errors) > self.MAX_PROCESSED_ERRORS:
+                self.processed_errors.popitem(last=False)
     
     def monitor_logs(self, follow: bool = False) -> List[LogError]:
         """Monitor log file for new errors"""
@@ -255,32 +376,194 @@ def get_cached_data(key):
             print(f"❌ Log file not found: {self.log_file_path}")
             return errors
         
-        with open(self.log_file_path, 'r', encoding='utf-8') as f:
-            if follow:
-                # Follow mode - tail the file
-                f.seek(0, 2)  # Go to end of file
-                while True:
-                    line = f.readline()
-                    if line:
-                        error = self.parse_log_line(line)
-                        if error:
-                            signature = self.create_error_signature(error)
-                            if signature not in self.processed_errors:
-                                errors.append(error)
-                                self.processed_errors.add(signature)
+        if not follow:
+            # One-time scan
+            self._scan_mapped(errors)
+            return errors
+        
+        # Follow mode - tail the file, waking on change notifications
+        watcher = LogWatcher(str(self.log_file_path))
+        fd = os.open(self.log_file_path, os.O_RDONLY)
+        pending = bytearray()
+        try:
+            os.lseek(fd, 0, os.SEEK_END)
+            while True:
+                chunk = os.read(fd, self.FOLLOW_READ_SIZE)
+                if not chunk:
+                    if watcher.available:
+                        watcher.wait()
                     else:
                         time.sleep(1)
-            else:
-                # One-time scan
+                    continue
+                
+                pending.extend(chunk)
+                end = pending.rfind(b'\n') + 1
+                if end == 0:
+                    continue
+                
+                # Split complete lines in bulk; only error lines are decoded
+                for line in pending[:end].split(b'\n')[:-1]:
+                    if line.startswith(_ERROR_LEVEL_PREFIXES):
+                        self._collect_error(line.decode('utf-8', 'replace'), errors)
+                del pending[:end]
+        finally:
+            os.close(fd)
+            watcher.close()
+    
+    def _scan_mapped(self, errors: List[LogError]):
+        """Scan complete lines from scan_offset onwards in a single regex pass"""
+        with open(self.log_file_path, 'rb') as f:
+            file_stat = os.fstat(f.fileno())
+            if not stat.S_ISREG(file_stat.st_mode):
+                # Pipes and other streams can't be mapped; read them line by line
                 for line in f:
-                    error = self.parse_log_line(line)
-                    if error:
-                        signature = self.create_error_signature(error)
-                        if signature not in self.processed_errors:
-                            errors.append(error)
-                            self.processed_errors.add(signature)
+                    if line.startswith(_ERROR_LEVEL_PREFIXES):
+                        self._collect_error(line.decode('utf-8', 'replace'), errors)
+                return
+            
+            size = file_stat.st_size
+            file_id = (file_stat.st_dev, file_stat.st_ino)
+            if file_id != self.scan_file_id or size < self.scan_offset:
+                # Log was rotated or truncated; start over
+                self.scan_offset = 0
+                self.scan_file_id = file_id
+            if size == self.scan_offset:
+                return
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Leave a trailing partial line for the next scan
+                end = mm.rfind(b'\n', self.scan_offset) + 1
+                if end == 0:
+                    return
+                
+                if end - self.scan_offset >= self.PARALLEL_SCAN_MIN_BYTES and (os.cpu_count() or 1) > 1:
+                    self._scan_parallel(mm, self.scan_offset, end, errors)
+                else:
+                    self._scan_range(mm, self.scan_offset, end, errors)
+                
+                self.scan_offset = end
+    
+    def _scan_range(self, mm: mmap.mmap, start: int, end: int, errors: List[LogError]):
+        """Collect errors from the complete lines in mm[start:end]"""
+        for match in _LOG_LINE_RE.finditer(mm, start, end):
+            level, timestamp, module, message = (
+                group.decode('utf-8', 'replace') for group in match.groups()
+            )
+            error = self._build_error(level, timestamp, module, message.rstrip())
+            self._record_error(error, errors)
+    
+    def _scan_parallel(self, mm: mmap.mmap, start: int, end: int, errors: List[LogError]):
+        """Scan mm[start:end] across CPU cores in newline-aligned chunks"""
+        workers = os.cpu_count()
+        step = (end - start) // workers
+        bounds = [start]
+        for i in range(1, workers):
+            boundary = mm.find(b'\n', start + i * step, end) + 1
+            if boundary > bounds[-1]:
+                bounds.append(boundary)
+        if bounds[-1] != end:
+            bounds.append(end)
         
-        return errors
+        path = str(self.log_file_path)
+        try:
+            with ProcessPoolExecutor(max_workers=len(bounds) - 1) as pool:
+                chunks = list(pool.map(_scan_chunk, [path] * (len(bounds) - 1), bounds[:-1], bounds[1:]))
+        except (OSError, BrokenProcessPool):
+            # No worker processes available here; scan in this process
+            self._scan_range(mm, start, end, errors)
+            return
+        
+        # Merge in file order so the first occurrence of an error still wins
+        for chunk in chunks:
+            for error in chunk:
+                self._record_error(error, errors)
+
+# Per-process monitor reused by parallel scan workers
+_worker_monitor = None
+
+def _scan_chunk(log_file_path: str, start: int, end: int) -> List[LogError]:
+    """Parallel scan worker: collect errors from one chunk of the log"""
+    global _worker_monitor
+    if _worker_monitor is None:
+        _worker_monitor = LogMonitor(log_file_path, '', '')
+    
+    errors = []
+    with open(log_file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            _worker_monitor._scan_range(mm, start, end, errors)
+    return errors
+
+class LogWatcher:
+    """Blocks until a log file changes, using inotify on Linux"""
+    
+    # inotify(7) event masks
+    IN_MODIFY = 0x00000002
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    EVENT_HEADER = struct.Struct('iIII')
+    
+    def __init__(self, log_file_path: str, debounce: float = 0.1):
+        self.log_file_path = Path(log_file_path)
+        self.debounce = debounce
+        self.fd = None
+        
+        # Watch the parent directory so rotated/recreated files are still seen
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return
+            mask = self.IN_MODIFY | self.IN_MOVED_TO | self.IN_CREATE
+            watch_dir = os.fsencode(self.log_file_path.parent.resolve())
+            if libc.inotify_add_watch(fd, watch_dir, mask) < 0:
+                os.close(fd)
+                return
+            self.fd = fd
+        except (OSError, AttributeError, TypeError):
+            # No inotify on this platform
+            self.fd = None
+    
+    @property
+    def available(self) -> bool:
+        """Whether kernel change notifications are in use"""
+        return self.fd is not None
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the log file to change; returns False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return False
+            if self._drain_events():
+                # Coalesce bursts of writes into a single wake-up
+                time.sleep(self.debounce)
+                self._drain_events()
+                return True
+    
+    def _drain_events(self) -> bool:
+        """Read all pending events; returns True if any touched the log file"""
+        name = os.fsencode(self.log_file_path.name)
+        touched = False
+        while True:
+            try:
+                buf = os.read(self.fd, 4096)
+            except BlockingIOError:
+                return touched
+            offset = 0
+            while offset < len(buf):
+                _, _, _, length = self.EVENT_HEADER.unpack_from(buf, offset)
+                offset += self.EVENT_HEADER.size
+                if buf[offset:offset + length].rstrip(b'\0') == name:
+                    touched = True
+                offset += length
+    
+    def close(self):
+        """Release the inotify descriptor"""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
 
 if __name__ == "__main__":
     # Example usage
@@ -5,9 +5,58 @@ Helps you prepare the automation system for production deployment
 """
 
 import os
+import sys
 import shutil
 import json
+import argparse
 from pathlib import Path
+from typing import List
+
+def _fastcopy(src: Path, dst: Path):
+    """Copy a file and its metadata, letting the kernel move the bytes where possible"""
+    # Opening dst for writing truncates it, so never copy a file onto itself
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    
+    done = False
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        # Kernel stopped short of the reported size; copy in userspace
+                        break
+                    remaining -= copied
+                done = remaining == 0
+        except OSError:
+            # Unsupported by this kernel or filesystem pair
+            pass
+    if not done:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+def _copy_essentials(src_dir: Path, dst_dir: Path, essential_files: List[str]):
+    """Copy the essential files from src_dir into dst_dir in one tree walk"""
+    # copytree with dirs_exist_ok would otherwise walk straight into itself
+    if Path(dst_dir).resolve() == Path(src_dir).resolve():
+        raise shutil.SameFileError(f"{str(src_dir)!r} and {str(dst_dir)!r} are the same directory")
+    
+    essential = set(essential_files)
+    found = set()
+    
+    def ignore(directory, names):
+        found.update(essential.intersection(names))
+        return [name for name in names if name not in essential]
+    
+    shutil.copytree(src_dir, dst_dir, ignore=ignore, copy_function=_fastcopy, dirs_exist_ok=True)
+    
+    for file_name in essential_files:
+        if file_name in found:
+            print(f"✅ Copied: {file_name}")
+        else:
+            print(f"⚠️ Missing: {file_name}")
 
 def create_production_structure():
     """Create the recommended production structure"""
@@ -39,14 +88,7 @@ def create_production_structure():
     ]
     
     # Copy essential files
-    for file_name in essential_files:
-        src_file = script_dir / file_name
-        if src_file.exists():
-            dst_file = monitor_dir / file_name
-            shutil.copy2(src_file, dst_file)
-            print(f"✅ Copied: {file_name}")
-        else:
-            print(f"⚠️ Missing: {file_name}")
+    _copy_essentials(script_dir, monitor_dir, essential_files)
     
     # Create production config
     prod_config = {
@@ -172,12 +214,7 @@ def create_separate_repo_structure():
     ]
     
     # Copy essential files
-    for file_name in essential_files:
-        src_file = script_dir / file_name
-        if src_file.exists():
-            dst_file = repo_dir / file_name
-            shutil.copy2(src_file, dst_file)
-            print(f"✅ Copied: {file_name}")
+    _copy_essentials(script_dir, repo_dir, essential_files)
     
     # Create README for separate repo
     readme_content = """# 🤖 Gym Automation Monitor
@@ -241,6 +278,7 @@ See `DEPLOYMENT_INSTRUCTIONS.md` for production deployment guide.
     gitignore_content = """# Logs
 *.log
 logs/
+scan_state.json
 
 # Config with secrets
 config.production.json
@@ -288,27 +326,30 @@ Thumbs.db
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="🚀 Gym Automation - Deployment Preparation")
+    parser.add_argument(
+        '--mode',
+        choices=['prod', 'repo', 'both'],
+        default='both',
+        help='prod: production deployment (same repo), '
+             'repo: separate repository (recommended), both: create both'
+    )
+    args = parser.parse_args()
+    
     print("🚀 Gym Automation - Deployment Preparation")
     print("=" * 50)
     
-    print("\nChoose deployment strategy:")
-    print("1. Production deployment (same repo)")
-    print("2. Separate repository (recommended)")
-    print("3. Both")
-    
-    choice = input("\nEnter choice (1-3): ").strip()
-    
-    if choice == "1":
-        create_production_structure()
-    elif choice == "2":
-        create_separate_repo_structure()
-    elif choice == "3":
-        create_production_structure()
-        print("\n" + "="*50)
-        create_separate_repo_structure()
-    else:
-        print("❌ Invalid choice")
-        return
+    try:
+        if args.mode in ('prod', 'both'):
+            create_production_structure()
+        if args.mode == 'both':
+            print("\n" + "="*50)
+        if args.mode in ('repo', 'both'):
+            create_separate_repo_structure()
+    except shutil.SameFileError as e:
+        # e.g. running from a checkout that is itself named gym-automation-monitor
+        print(f"\n❌ Refusing to overwrite the source files: {e}")
+        sys.exit(1)
     
     print(f"\n✅ Deployment preparation completed!")
 
@@ -8,6 +8,14 @@ import json
 import shutil
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the standard library
+    orjson = None
+
+# Both parsers accept bytes, so files are never decoded separately
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 def setup_system_config():
     """Setup system configuration from template"""
     template_file = Path('config.example.json')
@@ -26,7 +34,7 @@ def setup_system_config():
     print("✅ Created config.json from template")
     
     # Load and customize
-    config = json.loads(config_file.read_text())
+    config = _json_loads(config_file.read_bytes())
     
     print("\n🔧 Please customize config.json with your settings:")
     print(f"   - repo_owner: {config['repo_owner']}")
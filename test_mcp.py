@@ -8,6 +8,14 @@ import json
 import os
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the standard library
+    orjson = None
+
+# Both parsers accept bytes, so files are never decoded separately
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 def test_mcp_config():
     """Test MCP configuration"""
     print("🔍 Testing MCP Configuration...")
@@ -18,7 +26,7 @@ def test_mcp_config():
         return False
     
     try:
-        config = json.loads(mcp_file.read_text())
+        config = _json_loads(mcp_file.read_bytes())
         github_config = config.get('mcpServers', {}).get('github-copilot', {})
         
         if not github_config:
@@ -67,7 +75,7 @@ def test_github_token():
     mcp_file = Path('.kiro/settings/mcp.json')
     if mcp_file.exists():
         try:
-            config = json.loads(mcp_file.read_text())
+            config = _json_loads(mcp_file.read_bytes())
             token = config.get('mcpServers', {}).get('github-copilot', {}).get('env', {}).get('GITHUB_PERSONAL_ACCESS_TOKEN', '')
             
             if token and token != 'ghp_your_token_here':
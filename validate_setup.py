@@ -5,149 +5,261 @@ Validates that all components are properly configured
 """
 
 import os
+import re
+import sys
 import json
-import subprocess
+import time
+import shutil
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:  # Only needed for annotations; the probe imports it lazily
+    import subprocess
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the standard library
+    orjson = None
+
+# The interpreter can't change during a run
+_PY_OK = sys.version_info >= (3, 8)
+
+# Classic personal access token: 'ghp_' plus at least 36 alphanumerics
+_GHP_RE = re.compile(r'ghp_[A-Za-z0-9]{36,}')
+
+# Output lines buffered per thread by say(); written once at the end of main()
+_output = threading.local()
+
+def say(message: str = ''):
+    """Buffer one line of output for the current thread"""
+    lines = getattr(_output, 'lines', None)
+    if lines is None:
+        print(message)  # Called outside main(); nothing to buffer into
+    else:
+        lines.append(message)
+
+MCP_CONFIG_FILE = Path('.kiro/settings/mcp.json')
+SYSTEM_CONFIG_FILE = Path('config.json')
+
+def _read_json(path: Path) -> Dict:
+    """Parse a JSON file straight from bytes, using orjson when available"""
+    # A full parse is kept on purpose: the checks report invalid JSON, and a
+    # regex pulling out only the known fields measured no faster than orjson
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'rb') as f:
+        return json.load(f)
+
+@lru_cache(maxsize=None)
+def _load_mcp() -> Optional[Dict]:
+    """Parse the MCP config once; None if it is missing or not valid JSON"""
+    try:
+        return _read_json(MCP_CONFIG_FILE)
+    except (OSError, ValueError):  # ValueError covers JSON and UTF-8 decode errors
+        return None
+
+@lru_cache(maxsize=None)
+def _mcp_token() -> str:
+    """GitHub token from the MCP config; '' if it is absent or not a string"""
+    try:
+        token = _load_mcp()['mcpServers']['github-copilot']['env']['GITHUB_PERSONAL_ACCESS_TOKEN']
+    except (KeyError, TypeError):
+        return ''
+    return token if isinstance(token, str) else ''
+
+@lru_cache(maxsize=None)
+def _load_system_config() -> Optional[Dict]:
+    """Parse config.json once; None if it is missing or not valid JSON"""
+    try:
+        return _read_json(SYSTEM_CONFIG_FILE)
+    except (OSError, ValueError):  # ValueError covers JSON and UTF-8 decode errors
+        return None
+
+# Successful tool probes, keyed by the binary's path, mtime and size
+PROBE_CACHE_FILE = Path.home() / '.cache' / 'gym-automation' / 'probe.json'
+PROBE_CACHE_TTL = 24 * 60 * 60  # npx resolves packages remotely, so passes expire
+
+def _load_probe_cache() -> Dict:
+    """Read the probe cache, treating a missing or corrupt file as empty"""
+    try:
+        with open(PROBE_CACHE_FILE, 'rb') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _cached_probe(cmd: List[str], accept: Callable[['subprocess.CompletedProcess'], bool],
+                  timeout=None) -> bool:
+    """Run a tool probe unless the same binary passed it within PROBE_CACHE_TTL"""
+    tool_path = shutil.which(cmd[0])
+    key = None
+    if tool_path is not None:
+        stat = os.stat(tool_path)
+        key = f"{' '.join(cmd)}|{tool_path}|{stat.st_mtime_ns}|{stat.st_size}"
+        entry = _load_probe_cache().get(key)
+        if entry is not None and time.time() - entry.get('time', 0) < PROBE_CACHE_TTL:
+            return True
+    
+    # Imported here so runs that never spawn a probe skip its import cost
+    import subprocess
+    
+    # Only stderr is inspected; stdin is closed so npx can't wait on a prompt
+    try:
+        result = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, timeout=timeout)
+    except subprocess.TimeoutExpired as e:
+        raise TimeoutError(str(e)) from e
+    if not accept(result):
+        return False
+    
+    if key is not None:
+        cache = _load_probe_cache()
+        cache[key] = {'ok': True, 'time': time.time()}
+        try:
+            PROBE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(PROBE_CACHE_FILE, 'w') as f:
+                json.dump(cache, f, indent=2)
+        except OSError:
+            pass  # Caching is best effort
+    return True
 
 def check_python():
     """Check Python version"""
-    import sys
-    version = sys.version_info
-    if version.major >= 3 and version.minor >= 8:
-        print("✅ Python 3.8+ detected")
-        return True
+    if _PY_OK:
+        say("✅ Python 3.8+ detected")
     else:
-        print(f"❌ Python {version.major}.{version.minor} detected, need 3.8+")
-        return False
+        say(f"❌ Python {sys.version_info.major}.{sys.version_info.minor} detected, need 3.8+")
+    return _PY_OK
 
 def check_uvx():
     """Check if uvx is installed"""
-    try:
-        result = subprocess.run(['uvx', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ uvx is installed")
-            return True
-    except FileNotFoundError:
-        pass
+    if shutil.which('uvx'):
+        say("✅ uvx is installed")
+        return True
     
-    print("❌ uvx not found. Install with: pip install uv")
+    say("❌ uvx not found. Install with: pip install uv")
     return False
 
 def check_mcp_config():
     """Check MCP configuration"""
-    mcp_file = Path('.kiro/settings/mcp.json')
-    if not mcp_file.exists():
-        print("❌ MCP config not found at .kiro/settings/mcp.json")
+    if not MCP_CONFIG_FILE.exists():
+        say("❌ MCP config not found at .kiro/settings/mcp.json")
         return False
     
-    try:
-        config = json.loads(mcp_file.read_text())
-        if 'mcpServers' in config and 'github-copilot' in config['mcpServers']:
-            github_config = config['mcpServers']['github-copilot']
-            token = github_config.get('env', {}).get('GITHUB_PERSONAL_ACCESS_TOKEN', '')
-            
-            if token and token != 'ghp_your_token_here':
-                print("✅ MCP GitHub configuration found")
-                return True
-            else:
-                print("❌ GitHub token not configured in MCP config")
-                return False
+    config = _load_mcp()
+    if config is None:
+        say("❌ Invalid JSON in MCP config")
+        return False
+    
+    if 'mcpServers' in config and 'github-copilot' in config['mcpServers']:
+        token = _mcp_token()
+        
+        if token and token != 'ghp_your_token_here':
+            say("✅ MCP GitHub configuration found")
+            return True
         else:
-            print("❌ GitHub server not configured in MCP config")
+            say("❌ GitHub token not configured in MCP config")
             return False
-    except json.JSONDecodeError:
-        print("❌ Invalid JSON in MCP config")
+    else:
+        say("❌ GitHub server not configured in MCP config")
         return False
 
 def check_system_config():
     """Check system configuration"""
-    config_file = Path('config.json')
-    if not config_file.exists():
-        print("❌ System config not found: config.json")
+    if not SYSTEM_CONFIG_FILE.exists():
+        say("❌ System config not found: config.json")
+        return False
+    
+    config = _load_system_config()
+    if config is None:
+        say("❌ Invalid JSON in config.json")
         return False
     
+    required_fields = ['repo_owner', 'repo_name', 'log_file_path']
+    
+    for field in required_fields:
+        if field not in config:
+            say(f"❌ Missing required field in config.json: {field}")
+            return False
+    
+    # Check if log file path exists or can be created
+    log_path = Path(config['log_file_path'])
+    log_dir = log_path.parent
+    
     try:
-        config = json.loads(config_file.read_text())
-        required_fields = ['repo_owner', 'repo_name', 'log_file_path']
-        
-        for field in required_fields:
-            if field not in config:
-                print(f"❌ Missing required field in config.json: {field}")
-                return False
-        
-        # Check if log file path exists or can be created
-        log_path = Path(config['log_file_path'])
-        log_dir = log_path.parent
-        
-        if not log_dir.exists():
-            try:
-                log_dir.mkdir(parents=True, exist_ok=True)
-                print(f"✅ Created log directory: {log_dir}")
-            except Exception as e:
-                print(f"❌ Cannot create log directory {log_dir}: {e}")
-                return False
-        
-        print("✅ System configuration is valid")
-        return True
-        
-    except json.JSONDecodeError:
-        print("❌ Invalid JSON in config.json")
+        log_dir.mkdir(parents=True, exist_ok=True)
+        say(f"✅ Log directory ready: {log_dir}")
+    except Exception as e:
+        say(f"❌ Cannot create log directory {log_dir}: {e}")
         return False
+    
+    say("✅ System configuration is valid")
+    return True
 
 def check_github_token():
     """Check if GitHub token is accessible"""
     # Check environment variable
     token = os.getenv('GITHUB_PERSONAL_ACCESS_TOKEN')
     if token:
-        print("✅ GitHub token found in environment")
+        say("✅ GitHub token found in environment")
         return True
     
     # Check MCP config
-    mcp_file = Path('.kiro/settings/mcp.json')
-    if mcp_file.exists():
-        try:
-            config = json.loads(mcp_file.read_text())
-            token = config.get('mcpServers', {}).get('github-copilot', {}).get('env', {}).get('GITHUB_PERSONAL_ACCESS_TOKEN', '')
-            if token and token != 'ghp_your_token_here':
-                # Validate token format
-                if len(token) >= 40 and token.startswith('ghp_'):
-                    print("✅ GitHub token found in MCP config")
-                    return True
-                else:
-                    print("❌ GitHub token format invalid (should start with ghp_ and be 40+ chars)")
-                    return False
-        except:
-            pass
+    token = _mcp_token()
+    if token and token != 'ghp_your_token_here':
+        # Validate token format
+        if _GHP_RE.fullmatch(token):
+            say("✅ GitHub token found in MCP config")
+            return True
+        else:
+            say("❌ GitHub token format invalid (should be ghp_ followed by 36+ letters or digits)")
+            return False
     
-    print("❌ GitHub token not found. Set GITHUB_PERSONAL_ACCESS_TOKEN")
+    say("❌ GitHub token not found. Set GITHUB_PERSONAL_ACCESS_TOKEN")
     return False
 
+MCP_SERVER_PACKAGE = Path('node_modules/@modelcontextprotocol/server-github/package.json')
+
+def _mcp_server_installed() -> bool:
+    """Whether the MCP GitHub server package is already on disk for npx"""
+    if MCP_SERVER_PACKAGE.exists():
+        return True
+    # Packages npx has fetched before live in its per-hash cache directories
+    npx_cache = Path.home() / '.npm' / '_npx'
+    return any(npx_cache.glob(f'*/{MCP_SERVER_PACKAGE}'))
+
 def check_mcp_server():
     """Check if MCP GitHub server is available"""
     try:
         # Check if npx is available
-        result = subprocess.run(['npx', '--version'], capture_output=True, text=True, timeout=5)
-        if result.returncode != 0:
-            print("❌ npx not found. Install Node.js and npm")
+        if not shutil.which('npx'):
+            say("❌ npx not found. Install Node.js and npm")
             return False
         
+        if _mcp_server_installed():
+            say("✅ MCP GitHub server is available")
+            return True
+        
         # Check if the MCP server package is available
-        result = subprocess.run(['npx', '@modelcontextprotocol/server-github', '--help'], 
-                              capture_output=True, text=True, timeout=10)
-        if result.returncode == 0 or "github" in result.stderr.lower():
-            print("✅ MCP GitHub server is available")
+        if _cached_probe(['npx', '@modelcontextprotocol/server-github', '--help'],
+                         lambda result: result.returncode == 0 or b"github" in result.stderr.lower(),
+                         timeout=10):
+            say("✅ MCP GitHub server is available")
             return True
         else:
-            print("❌ MCP GitHub server not responding correctly")
+            say("❌ MCP GitHub server not responding correctly")
             return False
-    except subprocess.TimeoutExpired:
-        print("✅ MCP GitHub server is available (timeout expected)")
+    except TimeoutError:
+        say("✅ MCP GitHub server is available (timeout expected)")
         return True
     except FileNotFoundError:
-        print("❌ npx not found. Install Node.js: https://nodejs.org/")
+        say("❌ npx not found. Install Node.js: https://nodejs.org/")
         return False
     except Exception as e:
-        print(f"❌ Error testing MCP server: {e}")
+        say(f"❌ Error testing MCP server: {e}")
         return False
 
 def check_files():
@@ -159,53 +271,98 @@ def check_files():
         'deploy.py'
     ]
     
+    # One directory listing instead of a stat() per file
+    with os.scandir('.') as entries:
+        present = {entry.name for entry in entries}
+    
     all_exist = True
     for file in required_files:
-        if Path(file).exists():
-            print(f"✅ {file} found")
+        if file in present:
+            say(f"✅ {file} found")
         else:
-            print(f"❌ {file} missing")
+            say(f"❌ {file} missing")
             all_exist = False
     
     return all_exist
 
+CHECKS = (
+    ("Python Version", check_python),
+    ("uvx Installation", check_uvx),
+    ("Required Files", check_files),
+    ("System Config", check_system_config),
+    ("MCP Config", check_mcp_config),
+    ("MCP GitHub Server", check_mcp_server),
+    ("GitHub Token", check_github_token),
+)
+
+def _run_check(check_func: Callable[[], bool]) -> Tuple[bool, List[str]]:
+    """Run one check, returning its result and the lines it said"""
+    previous = getattr(_output, 'lines', None)
+    _output.lines = []
+    try:
+        return check_func(), _output.lines
+    finally:
+        _output.lines = previous
+
 def main():
     """Run all validation checks"""
-    print("🔍 Log Monitor Automation - Setup Validation")
-    print("=" * 50)
-    
-    checks = [
-        ("Python Version", check_python),
-        ("uvx Installation", check_uvx),
-        ("Required Files", check_files),
-        ("System Config", check_system_config),
-        ("MCP Config", check_mcp_config),
-        ("MCP GitHub Server", check_mcp_server),
-        ("GitHub Token", check_github_token),
-    ]
+    parser = argparse.ArgumentParser(description="🔍 Log Monitor Automation - Setup Validation")
+    parser.add_argument('--force', action='store_true',
+                        help='ignore cached tool probes and run them again')
+    parser.add_argument('--fail-fast', action='store_true',
+                        help='run checks one at a time and stop at the first failure')
+    args = parser.parse_args()
     
-    passed = 0
-    total = len(checks)
+    if args.force:
+        try:
+            PROBE_CACHE_FILE.unlink()
+        except FileNotFoundError:
+            pass
+    
+    _output.lines = []
+    say("🔍 Log Monitor Automation - Setup Validation")
+    say("=" * 50)
+    
+    # Parse the config files once, before the checks that share them start
+    _mcp_token()
+    _load_system_config()
+    
+    if args.fail_fast:
+        # Declared order, so the slow probes are skipped once a check fails
+        results = []
+        for _, check_func in CHECKS:
+            results.append(_run_check(check_func))
+            if not results[-1][0]:
+                break
+    else:
+        # Checks are independent, so their subprocesses and file reads overlap;
+        # each collects its own output, which is reported in the declared order
+        with ThreadPoolExecutor(max_workers=len(CHECKS)) as pool:
+            results = list(pool.map(_run_check, [check_func for _, check_func in CHECKS]))
     
-    for name, check_func in checks:
-        print(f"\n🔍 Checking {name}...")
-        if check_func():
-            passed += 1
+    for (name, _), (_, lines) in zip(CHECKS, results):
+        say(f"\n🔍 Checking {name}...")
+        _output.lines.extend(lines)
+    passed = sum(ok for ok, _ in results)
     
-    print("\n" + "=" * 50)
-    print(f"📊 Validation Results: {passed}/{total} checks passed")
+    say("\n" + "=" * 50)
+    say(f"📊 Validation Results: {passed}/{len(CHECKS)} checks passed")
+    if len(results) < len(CHECKS):
+        say(f"⏭️ Skipped {len(CHECKS) - len(results)} remaining checks (--fail-fast)")
     
-    if passed == total:
-        print("🎉 All checks passed! System is ready to use.")
-        print("\n🚀 Next steps:")
-        print("   python automation.py simulate")
-        print("   python automation.py scan")
-        print("   python automation.py monitor")
+    if passed == len(CHECKS):
+        say("🎉 All checks passed! System is ready to use.")
+        say("\n🚀 Next steps:")
+        say("   python automation.py simulate")
+        say("   python automation.py scan")
+        say("   python automation.py monitor")
+        status = 0
     else:
-        print("❌ Some checks failed. Please fix the issues above.")
-        return 1
+        say("❌ Some checks failed. Please fix the issues above.")
+        status = 1
     
-    return 0
+    sys.stdout.write("\n".join(_output.lines) + "\n")
+    return status
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    exit(main())